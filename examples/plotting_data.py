@@ -1,30 +1,42 @@
-import os
+import pathlib
+import numpy as np
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
 import oemoflex.tools.plots as plots
 
+# plots are only saved to files, so a non-interactive backend suffices
+matplotlib.use("Agg")
+
+# frames derived from the data are views until they are written to
+pd.set_option("mode.copy_on_write", True)
+
 # import data and yaml files
-here = os.path.abspath(os.path.dirname(__file__))
-input_path = os.path.join(
-    here, "03_postprocessed", "simple_model", "sequences", "bus", "A-electricity.csv"
+here = pathlib.Path(__file__).resolve().parent
+input_path = here.joinpath(
+    "03_postprocessed", "simple_model", "sequences", "bus", "A-electricity.csv"
 )
 
 try:
-    data = pd.read_csv(input_path, header=[0, 1, 2], parse_dates=[0], index_col=[0])
+    data = plots.load_bus_sequences(input_path)
 except FileNotFoundError:
     raise FileNotFoundError(
         f"Missing file: {input_path}.\nPlease run 'simple_model' first."
     )
 
 # create directory for plots
-path_plotted = os.path.join(here, "04_plotted")
-if not os.path.exists(path_plotted):
-    os.makedirs(path_plotted)
+path_plotted = here / "04_plotted"
+path_plotted.mkdir(parents=True, exist_ok=True)
 
 # prepare data
+# single precision is sufficient for plotting and halves the memory
+data = data.astype("float32", copy=False)
+
 # convert data to SI-unit
 conv_number = 1000
-data = data * conv_number
+data *= np.float32(conv_number)
+
+# the prepared data is shared by the interactive and the static plot
 df, df_demand = plots.prepare_dispatch_data(
     data, bus_name="A-electricity", demand_name="demand"
 )
@@ -37,13 +49,13 @@ fig = plots.plot_dispatch_plotly(
 )
 
 # save the plot
-filename = os.path.join(here, "04_plotted", "dispatch_interactive.html")
+filename = path_plotted / "dispatch_interactive.html"
 fig.write_html(
     file=filename,
-    # include_plotlyjs=False,
-    # full_html=False
+    # load plotly.js from the CDN instead of embedding it in every file
+    include_plotlyjs="cdn",
 )
-print(f"Saved static dispatch plot to {filename}")
+print(f"Saved interactive dispatch plot to {filename}")
 
 # create static dispatch plot
 fig, ax = plt.subplots(figsize=(12, 5))
@@ -53,14 +65,19 @@ end_date = "2016-01-10 23:00:00"
 df_time_filtered = plots.filter_timeseries(df, start_date, end_date)
 df_demand_time_filtered = plots.filter_timeseries(df_demand, start_date, end_date)
 
+# the stacked areas have a vertex per timestep, rasterize them for vector formats
 plots.plot_dispatch(
-    ax=ax, df=df_time_filtered, df_demand=df_demand_time_filtered, unit="W"
+    ax=ax,
+    df=df_time_filtered,
+    df_demand=df_demand_time_filtered,
+    unit="W",
+    rasterized=True,
 )
 
 plt.legend(loc="best")
 plt.tight_layout()
 
 # save the plot
-filename = os.path.join(here, "04_plotted", "dispatch_static.png")
+filename = path_plotted / "dispatch_static.png"
 plt.savefig(filename)
 print(f"Saved static dispatch plot to {filename}")
@@ -1,4 +1,4 @@
-import os
+import pathlib
 import numpy as np
 import pandas as pd
 from oemof.solph import EnergySystem, Model
@@ -11,10 +11,10 @@ from oemof.tabular.facades import TYPEMAP
 
 from oemoflex.model.datapackage import EnergyDataPackage, ResultsDataPackage
 
-here = os.path.abspath(os.path.dirname(__file__))
-preprocessed = os.path.join(here, "01_preprocessed", "simple_model")
-optimized = os.path.join(here, "02_optimized")
-postprocessed = os.path.join(here, "03_postprocessed", "simple_model")
+here = pathlib.Path(__file__).resolve().parent
+preprocessed = here / "01_preprocessed" / "simple_model"
+optimized = here / "02_optimized"
+postprocessed = here / "03_postprocessed" / "simple_model"
 
 # setup default structure
 edp = EnergyDataPackage.setup_default(
@@ -61,7 +61,7 @@ edp.infer_metadata()
 
 # create EnergySystem and Model and solve it.
 es = EnergySystem.from_datapackage(
-    os.path.join(preprocessed, "datapackage.json"),
+    str(preprocessed / "datapackage.json"),
     attributemap={},
     typemap=TYPEMAP,
 )
@@ -74,8 +74,7 @@ om.solve()
 es.results = om.results()
 es.params = parameter_as_dict(es)
 
-if not os.path.exists(optimized):
-    os.makedirs(optimized)
+optimized.mkdir(parents=True, exist_ok=True)
 
 es.dump(optimized)
 
@@ -1,9 +1,13 @@
+from numbers import Number
+
 from oemof import solph
 from oemof.solph import sequence, Bus, Flow, Investment
 from oemof.solph.components import GenericStorage, ExtractionTurbineCHP, Sink
 
 from oemof.tabular._facade import Facade
-from oemof.tabular.facades import Link, TYPEMAP
+from oemof.tabular.facades import Link, TYPEMAP  # noqa: F401
+
+POS_INF = float("+inf")
 
 
 class Source(solph.components.Source):
@@ -38,66 +42,95 @@ class Transformer(solph.components.Transformer):
 
 
 class Facade(Facade):
-    def _nominal_value(self):
-        """Returns None if self.expandable ist True otherwise it returns
-        the capacities
+    def _make_flow(self, capacity, capacity_cost, capacity_potential, **kwargs):
+        """Returns a Flow that is either expandable with an Investment or has
+        the capacity as its nominal value.
         """
         if self.expandable is True:
-            return None
-
-        if isinstance(self, Link):
-            return {"from_to": self.from_to_capacity, "to_from": self.to_from_capacity}
-
-        if isinstance(self, AsymmetricStorage):
-            return {
-                "charge": self.capacity_charge,
-                "discharge": self.capacity_discharge,
-            }
-
-        return self.capacity
+            return Flow(
+                investment=Investment(
+                    ep_costs=capacity_cost,
+                    maximum=capacity_potential,
+                    existing=capacity,
+                ),
+                **kwargs,
+            )
 
+        return Flow(nominal_value=capacity, **kwargs)
 
-class AsymmetricStorage(GenericStorage, Facade):
-    def __init__(self, *args, **kwargs):
+    def _set_attributes(self, kwargs):
+        """Sets the attributes listed in self._defaults from kwargs, falling
+        back to the defaults.
+        """
+        attributes = {**self._defaults, **kwargs}
 
-        super().__init__(_facade_requires_=["bus", "carrier", "tech"], *args, **kwargs)
+        # none of the classes in the hierarchy customizes attribute assignment,
+        # so the generic setter can be used directly
+        set_attribute = object.__setattr__
 
-        self.storage_capacity = kwargs.get("storage_capacity", 0)
+        for name in self._defaults:
+            set_attribute(self, name, attributes[name])
 
-        self.capacity_charge = kwargs.get("capacity_charge", 0)
-        self.capacity_discharge = kwargs.get("capacity_discharge", 0)
 
-        self.capacity_cost_charge = kwargs.get("capacity_cost_charge")
-        self.capacity_cost_discharge = kwargs.get("capacity_cost_discharge")
+class AsymmetricStorage(GenericStorage, Facade):
+    _facade_requires = ("bus", "carrier", "tech")
+
+    _defaults = {
+        "storage_capacity": 0,
+        "capacity_charge": 0,
+        "capacity_discharge": 0,
+        "capacity_cost_charge": None,
+        "capacity_cost_discharge": None,
+        "storage_capacity_cost": None,
+        "storage_capacity_potential": POS_INF,
+        "minimum_storage_capacity": 0,
+        "capacity_potential_charge": POS_INF,
+        "capacity_potential_discharge": POS_INF,
+        "marginal_cost": 0,
+        "efficiency_charge": 1,
+        "efficiency_discharge": 1,
+    }
 
-        self.storage_capacity_cost = kwargs.get("storage_capacity_cost")
+    def __init__(self, *args, **kwargs):
 
-        self.storage_capacity_potential = kwargs.get(
-            "storage_capacity_potential", float("+inf")
-        )
+        # validate before the solph constructor processes the kwargs
+        if kwargs.get("expandable", False) and (
+            kwargs.get("capacity_cost_charge") is None
+            or kwargs.get("capacity_cost_discharge") is None
+            or kwargs.get("storage_capacity_cost") is None
+        ):
+            msg = (
+                "If you set `expandable` to True you need to set "
+                "attribute `storage_capacity_cost`,"
+                "`capacity_cost_charge` and `capacity_cost_discharge` of component {}!"
+            )
+            raise ValueError(msg.format(kwargs.get("label")))
 
-        self.capacity_potential_charge = kwargs.get(
-            "capacity_potential_charge", float("+inf")
-        )
+        kwargs["_facade_requires_"] = self._facade_requires
+        super().__init__(*args, **kwargs)
 
-        self.capacity_potential_discharge = kwargs.get(
-            "capacity_potential_discharge", float("+inf")
-        )
+        self._set_attributes(kwargs)
 
         self.expandable = bool(kwargs.get("expandable", False))
 
-        self.marginal_cost = kwargs.get("marginal_cost", 0)
-
-        self.efficiency_charge = kwargs.get("efficiency_charge", 1)
-
-        self.efficiency_discharge = kwargs.get("efficiency_discharge", 1)
-
         self.input_parameters = kwargs.get("input_parameters", {})
 
         self.output_parameters = kwargs.get("output_parameters", {})
 
         self.build_solph_components()
 
+    def _nominal_value(self):
+        """Returns None if self.expandable ist True otherwise it returns
+        the capacities
+        """
+        if self.expandable is True:
+            return None
+
+        return {
+            "charge": self.capacity_charge,
+            "discharge": self.capacity_discharge,
+        }
+
     def build_solph_components(self):
 
         self.nominal_storage_capacity = self.storage_capacity
@@ -108,68 +141,35 @@ class AsymmetricStorage(GenericStorage, Facade):
 
         # self.investment = self._investment()
         if self.expandable is True:
-            if (
-                any(
-                    [
-                        self.capacity_cost_charge,
-                        self.capacity_cost_discharge,
-                        self.storage_capacity_cost,
-                    ]
-                )
-                is None
-            ):
-                msg = (
-                    "If you set `expandable` to True you need to set "
-                    "attribute `storage_capacity_cost`,"
-                    "`capacity_cost_charge` and `capacity_cost_discharge` of component {}!"
-                )
-                raise ValueError(msg.format(self.label))
-
             self.investment = Investment(
                 ep_costs=self.storage_capacity_cost,
-                maximum=getattr(self, "storage_capacity_potential", float("+inf")),
-                minimum=getattr(self, "minimum_storage_capacity", 0),
-                existing=getattr(self, "storage_capacity", 0),
-            )
-
-            fi = Flow(
-                investment=Investment(
-                    ep_costs=self.capacity_cost_charge,
-                    maximum=getattr(self, "capacity_potential_charge", float("+inf")),
-                    existing=getattr(self, "capacity_charge", 0),
-                ),
-                **self.input_parameters
+                maximum=self.storage_capacity_potential,
+                minimum=self.minimum_storage_capacity,
+                existing=self.storage_capacity,
             )
 
-            fo = Flow(
-                investment=Investment(
-                    ep_costs=self.capacity_cost_discharge,
-                    maximum=getattr(
-                        self, "capacity_potential_discharge", float("+inf")
-                    ),
-                    existing=getattr(self, "capacity_discharge", 0),
-                ),
-                # Attach marginal cost to Flow out
-                variable_costs=self.marginal_cost,
-                **self.output_parameters
-            )
             # required for correct grouping in oemof.solph.components
             self._invest_group = True
 
-        else:
-            fi = Flow(
-                nominal_value=self._nominal_value()["charge"], **self.input_parameters
-            )
-            fo = Flow(
-                nominal_value=self._nominal_value()["discharge"],
-                # Attach marginal cost to Flow out
-                variable_costs=self.marginal_cost,
-                **self.output_parameters
-            )
+        fi = self._make_flow(
+            self.capacity_charge,
+            self.capacity_cost_charge,
+            self.capacity_potential_charge,
+            **self.input_parameters,
+        )
+
+        fo = self._make_flow(
+            self.capacity_discharge,
+            self.capacity_cost_discharge,
+            self.capacity_potential_discharge,
+            # Attach marginal cost to Flow out
+            variable_costs=self.marginal_cost,
+            **self.output_parameters,
+        )
 
-        self.inputs.update({self.bus: fi})
+        self.inputs[self.bus] = fi
 
-        self.outputs.update({self.bus: fo})
+        self.outputs[self.bus] = fo
 
         self._set_flows()
 
@@ -268,35 +268,31 @@ class Bev(GenericStorage, Facade):
 
     """
 
+    _facade_requires = (
+        "bus",
+        "carrier",
+        "tech",
+        "availability",
+        "drive_power",
+        "amount",
+    )
+
+    _defaults = {
+        "storage_capacity": None,
+        "capacity": None,
+        "efficiency_charging": 1,
+        "efficiency_discharging": 1,
+        "efficiency_v2g": 1,
+        "profile": None,
+        "marginal_cost": 0,
+    }
+
     def __init__(self, *args, **kwargs):
 
-        kwargs.update(
-            {
-                "_facade_requires_": [
-                    "bus",
-                    "carrier",
-                    "tech",
-                    "availability",
-                    "drive_power",
-                    "amount",
-                ]
-            }
-        )
+        kwargs["_facade_requires_"] = self._facade_requires
         super().__init__(*args, **kwargs)
 
-        self.storage_capacity = kwargs.get("storage_capacity")
-
-        self.capacity = kwargs.get("capacity")
-
-        self.efficiency_charging = kwargs.get("efficiency_charging", 1)
-
-        self.efficiency_discharging = kwargs.get("efficiency_discharging", 1)
-
-        self.efficiency_v2g = kwargs.get("efficiency_v2g", 1)
-
-        self.profile = kwargs.get("profile")
-
-        self.marginal_cost = kwargs.get("marginal_cost", 0)
+        self._set_attributes(kwargs)
 
         self.input_parameters = kwargs.get("input_parameters", {})
 
@@ -317,26 +313,26 @@ class Bev(GenericStorage, Facade):
         if self.expandable:
             raise NotImplementedError("Investment for bev class is not implemented.")
 
-        internal_bus = Bus(label=self.label + "-internal_bus")
+        internal_bus = Bus(label=f"{self.label}-internal_bus")
 
         vehicle_to_grid = Transformer(
             carrier=self.carrier,
             tech=self.tech,
-            label=self.label + "-vehicle_to_grid",
+            label=f"{self.label}-vehicle_to_grid",
             inputs={internal_bus: Flow()},
             outputs={
                 self.bus: Flow(
                     nominal_value=self.capacity,
                     max=self.availability,
                     variable_costs=self.marginal_cost,
-                    **self.output_parameters
+                    **self.output_parameters,
                 )
             },
             conversion_factors={internal_bus: self.efficiency_v2g},
         )
 
         drive_power = Sink(
-            label=self.label + "-drive_power",
+            label=f"{self.label}-drive_power",
             inputs={
                 internal_bus: Flow(
                     nominal_value=self.amount, actual_value=self.drive_power, fixed=True
@@ -344,17 +340,11 @@ class Bev(GenericStorage, Facade):
             },
         )
 
-        self.inputs.update(
-            {
-                self.bus: Flow(
-                    nominal_value=self.capacity,
-                    max=self.availability,
-                    **self.input_parameters
-                )
-            }
+        self.inputs[self.bus] = Flow(
+            nominal_value=self.capacity, max=self.availability, **self.input_parameters
         )
 
-        self.outputs.update({internal_bus: Flow()})
+        self.outputs[internal_bus] = Flow()
 
         self.subnodes = (internal_bus, drive_power, vehicle_to_grid)
 
@@ -445,25 +435,25 @@ class ReservoirWithPump(GenericStorage, Facade):
 
     """
 
+    _facade_requires = (
+        "bus",
+        "carrier",
+        "tech",
+        "profile",
+        "capacity_pump",
+        "capacity_turbine",
+        "storage_capacity",
+        "efficiency_turbine",
+        "efficiency_pump",
+    )
+
+    _defaults = {"marginal_cost": 0}
+
     def __init__(self, *args, **kwargs):
-        kwargs.update(
-            {
-                "_facade_requires_": [
-                    "bus",
-                    "carrier",
-                    "tech",
-                    "profile",
-                    "capacity_pump",
-                    "capacity_turbine",
-                    "storage_capacity",
-                    "efficiency_turbine",
-                    "efficiency_pump",
-                ]
-            }
-        )
+        kwargs["_facade_requires_"] = self._facade_requires
         super().__init__(*args, **kwargs)
 
-        self.marginal_cost = kwargs.get("marginal_cost", 0)
+        self._set_attributes(kwargs)
 
         self.input_parameters = kwargs.get("input_parameters", {})
 
@@ -484,10 +474,10 @@ class ReservoirWithPump(GenericStorage, Facade):
                 "Investment for reservoir class is not implemented."
             )
 
-        internal_bus = Bus(label=self.label + "-internal_bus")
+        internal_bus = Bus(label=f"{self.label}-internal_bus")
 
         pump = Transformer(
-            label=self.label + "-pump",
+            label=f"{self.label}-pump",
             inputs={
                 self.bus: Flow(
                     nominal_value=self.capacity_pump, **self.input_parameters
@@ -500,7 +490,7 @@ class ReservoirWithPump(GenericStorage, Facade):
         )
 
         inflow = Source(
-            label=self.label + "-inflow",
+            label=f"{self.label}-inflow",
             outputs={
                 internal_bus: Flow(
                     nominal_value=self.capacity_turbine, max=self.profile, fixed=False
@@ -510,16 +500,12 @@ class ReservoirWithPump(GenericStorage, Facade):
             tech=self.tech,
         )
 
-        self.inputs.update({internal_bus: Flow()})
+        self.inputs[internal_bus] = Flow()
 
-        self.outputs.update(
-            {
-                self.bus: Flow(
-                    nominal_value=self.capacity_turbine,
-                    variable_costs=self.marginal_cost,
-                    **self.output_parameters
-                )
-            }
+        self.outputs[self.bus] = Flow(
+            nominal_value=self.capacity_turbine,
+            variable_costs=self.marginal_cost,
+            **self.output_parameters,
         )
 
         self.subnodes = (inflow, internal_bus, pump)
@@ -625,44 +611,54 @@ class ExtractionTurbine(
 
     """
 
-    def __init__(self, *args, **kwargs):
-        kwargs.update(
-            {
-                "_facade_requires_": [
-                    "fuel_bus",
-                    "carrier",
-                    "tech",
-                    "electricity_bus",
-                    "heat_bus",
-                    "thermal_efficiency",
-                    "electric_efficiency",
-                    "condensing_efficiency",
-                ]
-            }
-        )
-        super().__init__(conversion_factor_full_condensation={}, *args, **kwargs)
-
-        self.fuel_bus = kwargs.get("fuel_bus")
+    _facade_requires = (
+        "fuel_bus",
+        "carrier",
+        "tech",
+        "electricity_bus",
+        "heat_bus",
+        "thermal_efficiency",
+        "electric_efficiency",
+        "condensing_efficiency",
+    )
+
+    _defaults = {
+        "fuel_bus": None,
+        "electricity_bus": None,
+        "heat_bus": None,
+        "carrier": None,
+        "carrier_cost": 0,
+        "capacity": None,
+        "marginal_cost": 0,
+    }
 
-        self.electricity_bus = kwargs.get("electricity_bus")
+    def __init__(self, *args, **kwargs):
 
-        self.heat_bus = kwargs.get("heat_bus")
+        # validate before the solph constructor processes the kwargs
+        if kwargs.get("expandable", False):
+            raise NotImplementedError(
+                "Investment for extraction class is not implemented."
+            )
 
-        self.carrier = kwargs.get("carrier")
+        condensing_efficiency = kwargs.get("condensing_efficiency")
 
-        self.carrier_cost = kwargs.get("carrier_cost", 0)
+        if isinstance(condensing_efficiency, Number) and condensing_efficiency == 0:
+            raise ValueError(
+                "The condensing_efficiency of component {} must not be zero.".format(
+                    kwargs.get("label")
+                )
+            )
 
-        self.capacity = kwargs.get("capacity")
+        kwargs["_facade_requires_"] = self._facade_requires
+        super().__init__(conversion_factor_full_condensation={}, *args, **kwargs)
 
-        self.fuel_capacity = (
-            self.capacity / self.condensing_efficiency
-        )  # noqa: E501  # pylint: disable=access-member-before-definition  # done with kwargs.update()
+        self._set_attributes(kwargs)
 
-        self.condensing_efficiency = sequence(self.condensing_efficiency)
+        self.expandable = False
 
-        self.marginal_cost = kwargs.get("marginal_cost", 0)
+        self.fuel_capacity = self.capacity / condensing_efficiency
 
-        self.expandable = bool(kwargs.get("expandable", False))
+        self.condensing_efficiency = sequence(condensing_efficiency)
 
         self.input_parameters = kwargs.get("input_parameters", {})
 
@@ -670,11 +666,6 @@ class ExtractionTurbine(
 
     def build_solph_components(self):
 
-        if self.expandable:
-            raise NotImplementedError(
-                "Investment for extraction class is not implemented."
-            )
-
         self.conversion_factors.update(
             {
                 self.fuel_bus: sequence(1),
@@ -683,30 +674,25 @@ class ExtractionTurbine(
             }
         )
 
-        self.inputs.update(
-            {
-                self.fuel_bus: Flow(
-                    variable_costs=self.carrier_cost,
-                    nominal_value=self.fuel_capacity,
-                    **self.input_parameters
-                )
-            }
+        self.inputs[self.fuel_bus] = Flow(
+            variable_costs=self.carrier_cost,
+            nominal_value=self.fuel_capacity,
+            **self.input_parameters,
         )
 
-        self.outputs.update(
-            {
-                self.electricity_bus: Flow(
-                    variable_costs=self.marginal_cost,
-                ),
-                self.heat_bus: Flow(),
-            }
+        self.outputs[self.electricity_bus] = Flow(
+            variable_costs=self.marginal_cost,
         )
+        self.outputs[self.heat_bus] = Flow()
 
         self.conversion_factor_full_condensation.update(
             {self.electricity_bus: self.condensing_efficiency}
         )
 
 
+# Overrides oemof.tabular's own "reservoir" and "extraction" facades on purpose, so
+# registering only missing keys is not an option. The module body runs once per
+# process, as Python caches imported modules.
 TYPEMAP.update(
     {
         "asymmetric storage": AsymmetricStorage,
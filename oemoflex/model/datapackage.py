@@ -1,19 +1,13 @@
-import copy
 import os
+from functools import lru_cache, partial
 
-from oemof.tabular.datapackage.building import infer_metadata
+import numpy as np
 import pandas as pd
-from frictionless import Package
-from oemof.solph.views import convert_to_multiindex
 
+# oemof.solph, oemof.tabular, frictionless and the postprocessing are imported where
+# they are needed, so that reading and writing packages does not have to load them
 from oemoflex.model.model_structure import create_default_data
-from oemoflex.model.postprocessing import (
-    group_by_element,
-    run_postprocessing,
-    component_results,
-    bus_results,
-)
-from oemoflex.tools.helpers import load_yaml
+from oemoflex.tools.helpers import LazyDict, load_yaml
 from oemoflex.config.config import settings
 
 
@@ -21,7 +15,8 @@ module_path = os.path.dirname(os.path.abspath(__file__))
 
 FOREIGN_KEYS = "foreign_keys.yml"
 
-foreign_keys = load_yaml(os.path.join(module_path, FOREIGN_KEYS))
+# prefix of the directories that overwritten data is moved to before it is deleted
+TRASH_PREFIX = ".oemoflex-trash-"
 
 
 class DataFramePackage:
@@ -39,7 +34,7 @@ class DataFramePackage:
         self.data = data
 
     @classmethod
-    def from_csv_dir(cls, dir):
+    def from_csv_dir(cls, dir, lazy=False):
         r"""
         Initialize a DataFramePackage from a csv directory
 
@@ -47,10 +42,31 @@ class DataFramePackage:
         ----------
         dir : str
             Path to csv directory
+        lazy : bool
+            If True, each csv file is only read when its DataFrame is accessed.
         """
         rel_paths = cls._get_rel_paths(dir, ".csv")
 
-        data = cls._load_csv(cls, dir, rel_paths)
+        data = cls._load_csv(cls, dir, rel_paths, lazy=lazy)
+
+        return cls(dir, data, rel_paths)
+
+    @classmethod
+    def from_parquet_dir(cls, dir, lazy=False):
+        r"""
+        Initialize a DataFramePackage from a directory of parquet files as saved by
+        to_parquet_dir. Requires pyarrow or fastparquet to be installed.
+
+        Parameters
+        ----------
+        dir : str
+            Path to parquet directory
+        lazy : bool
+            If True, each parquet file is only read when its DataFrame is accessed.
+        """
+        rel_paths = cls._get_rel_paths(dir, ".parquet")
+
+        data = cls._load_csv(cls, dir, rel_paths, lazy=lazy)
 
         return cls(dir, data, rel_paths)
 
@@ -66,6 +82,36 @@ class DataFramePackage:
         overwrite : bool
             Decides if any existing files will be overwritten.
         """
+        self._to_dir(destination, overwrite, file_ext=".csv")
+
+    def to_parquet_dir(self, destination, overwrite=False, compression="snappy"):
+        r"""
+        Save the DataFramePackage to parquet files. Parquet keeps the dtypes and is faster to
+        write and read than csv, which makes it suitable for intermediate data. Requires
+        pyarrow or fastparquet to be installed.
+
+        Warns if overwrite is False and the destination is not empty. If overwrite is True,
+        all existing contents in destination will be deleted.
+
+        Parameters
+        ----------
+        destination : str
+            Path to store data to
+        overwrite : bool
+            Decides if any existing files will be overwritten.
+        compression : str or None
+            Compression of the parquet files, e.g. 'snappy', 'zstd' or None. 'zstd'
+            gives smaller files at slightly slower writes.
+        """
+        self._to_dir(
+            destination, overwrite, file_ext=".parquet", compression=compression
+        )
+
+    def _to_dir(self, destination, overwrite, file_ext, **kwargs):
+        r"""
+        Save the DataFramePackage to files with the given extension. The format is chosen
+        by _write_resource based on the extension. kwargs are passed to the writer.
+        """
         # Check if path exists and is non-empty
         if os.path.exists(destination) and os.listdir(destination):
             # If overwrite is False, throw a warning
@@ -77,71 +123,172 @@ class DataFramePackage:
 
             # If overwrite is True delete any contents
             elif overwrite:
-                import shutil
-
-                shutil.rmtree(destination)
+                # lazily loaded data may be read from the destination, so it has to be
+                # loaded before the destination is removed. All of it is written anyway.
+                if isinstance(self.data, LazyDict):
+                    for name in self.data:
+                        self.data[name]
 
-        for name, data in self.data.items():
-            path = self.rel_paths[name]
+                import logging
+                import shutil
+                import threading
+                import uuid
 
-            full_path = os.path.join(destination, path)
+                def log_error(function, path, excinfo):
+                    logging.warning(f"Could not delete '{path}': {excinfo[1]}")
 
-            dir_full_path = os.path.expanduser(os.path.dirname(full_path))
+                # move the old data aside and delete it in the background, so that
+                # writing the new data does not wait for the deletion. The trash is
+                # a sibling on the same file system, which _get_rel_paths skips.
+                destination = os.path.normpath(destination)
 
-            if not os.path.exists(dir_full_path):
+                trash = os.path.join(
+                    os.path.dirname(destination), TRASH_PREFIX + uuid.uuid4().hex
+                )
 
-                os.makedirs(dir_full_path)
+                try:
+                    os.rename(destination, trash)
+                except OSError:
+                    shutil.rmtree(destination)
+                else:
+                    threading.Thread(
+                        target=shutil.rmtree,
+                        args=(trash,),
+                        kwargs={"onerror": log_error},
+                    ).start()
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        full_paths = [
+            os.path.join(destination, os.path.splitext(self.rel_paths[name])[0])
+            + file_ext
+            for name in self.data.keys()
+        ]
 
-            self._write_resource(data, full_path)
+        # create each directory once instead of checking it for every file
+        for dir_full_path in {
+            os.path.expanduser(os.path.dirname(full_path)) for full_path in full_paths
+        }:
+            os.makedirs(dir_full_path, exist_ok=True)
+
+        max_workers = max(1, min(settings.MAX_WORKERS, len(full_paths)))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            # consume the results to raise errors of the single writes
+            list(
+                pool.map(
+                    partial(self._write_resource, **kwargs),
+                    self.data.values(),
+                    full_paths,
+                )
+            )
 
     @staticmethod
     def _get_rel_paths(dir, file_ext):
         r"""
         Get paths to all files in a given directory relative
-        to the root with a given file extension.
+        to the root with a given file extension. file_ext can also be a tuple of
+        extensions.
         """
         if not os.path.exists(dir):
             raise NotADirectoryError(f"Directory '{dir}' does not exist.")
 
+        file_exts = (file_ext,) if isinstance(file_ext, str) else tuple(file_ext)
+
         rel_paths = {}
-        for root, dirs, files in os.walk(dir):
 
-            rel_path = os.path.relpath(root, dir)
+        def collect(path, rel_path):
+            # same order as os.walk: files of a directory first, then its subdirectories
+            subdirs = []
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink() and not entry.name.startswith(
+                            TRASH_PREFIX
+                        ):
+                            subdirs.append(entry)
+                        continue
+
+                    for ext in file_exts:
+                        if entry.name.endswith(ext):
+                            name = entry.name[: -len(ext)]
+                            rel_paths[name] = rel_path + os.sep + entry.name
+                            break
+
+            for entry in subdirs:
+                sub_rel_path = (
+                    entry.name
+                    if rel_path == os.curdir
+                    else rel_path + os.sep + entry.name
+                )
+                collect(entry.path, sub_rel_path)
 
-            for file in files:
-                if file.endswith(file_ext):
-                    name = os.path.splitext(file)[0]
-                    rel_paths[name] = os.path.join(rel_path, file)
+        collect(dir, os.curdir)
 
         if not rel_paths:
             raise Warning(f"No files with extension '{file_ext}' found.")
 
         return rel_paths
 
-    def _load_csv(self, basepath, rel_paths):
+    def _load_csv(self, basepath, rel_paths, lazy=False, dtypes=None):
         r"""
-        Load a DataFramePackage from csv files.
+        Load a DataFramePackage from csv files. Parquet files are read as well, see
+        _read_resource. dtypes optionally maps resource names to the dtypes of their
+        columns.
         """
-        data = {}
+        from concurrent.futures import ThreadPoolExecutor
 
-        for name, path in rel_paths.items():
-            full_path = os.path.join(basepath, path)
-            data[name] = self._read_resource(full_path)
+        dtypes = dtypes or {}
+
+        readers = {
+            name: partial(
+                self._read_resource, os.path.join(basepath, path), dtypes.get(name)
+            )
+            for name, path in rel_paths.items()
+        }
+
+        if lazy:
+            return LazyDict(readers)
+
+        # reading is mostly I/O, so threads overlap it across files
+        max_workers = max(1, min(settings.MAX_WORKERS, len(readers)))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            frames = pool.map(lambda read: read(), readers.values())
+
+            data = dict(zip(readers.keys(), frames))
 
         return data
 
     @staticmethod
-    def _read_resource(path):
-        return pd.read_csv(path, index_col=settings.INDEX_COL, sep=settings.SEPARATOR)
+    def _read_resource(path, dtype=None):
+        if path.endswith(".parquet"):
+            return pd.read_parquet(path)
 
-    @staticmethod
-    def _write_resource(data, path):
-        root = os.path.split(path)[0]
+        kwargs = {}
 
-        if not os.path.exists(root):
-            os.makedirs(root)
+        if settings.CSV_ENGINE == "c":
+            # parse each file in one pass, which avoids mixed dtypes within a column
+            kwargs["low_memory"] = False
 
-        data.to_csv(path, sep=settings.SEPARATOR)
+            # map uncompressed files into memory instead of reading them into buffers
+            kwargs["memory_map"] = not path.endswith(_COMPRESSION_EXTENSIONS)
+
+        return pd.read_csv(
+            path,
+            index_col=settings.INDEX_COL,
+            sep=settings.SEPARATOR,
+            engine=settings.CSV_ENGINE,
+            dtype=dtype,
+            **kwargs,
+        )
+
+    @staticmethod
+    def _write_resource(data, path, **kwargs):
+        if path.endswith(".parquet"):
+            data.to_parquet(path, **kwargs)
+        else:
+            data.to_csv(path, sep=settings.SEPARATOR, **kwargs)
 
     def __repr__(self):
         raw_repr = super().__repr__()
@@ -207,7 +354,7 @@ class EnergyDataPackage(DataFramePackage):
         )
 
     @classmethod
-    def from_metadata(cls, json_file_path):
+    def from_metadata(cls, json_file_path, lazy=False):
         r"""
         Initialize a DataFramePackage from the metadata string,
         usually named datapackage.json
@@ -216,14 +363,26 @@ class EnergyDataPackage(DataFramePackage):
         ----------
         json_file_path : str
             Path to metadata
+        lazy : bool
+            If True, each csv file is only read when its DataFrame is accessed.
         """
-        dp = Package(json_file_path)
-
         dir = os.path.split(json_file_path)[0]
 
-        rel_paths = {r["name"]: r["path"] for r in dp.resources}
+        if settings.METADATA_CACHE:
+            stat = os.stat(json_file_path)
 
-        data = cls._load_csv(cls, dir, rel_paths)
+            # the cache key changes with the file, so edited metadata is parsed again
+            resources = _read_metadata(
+                os.path.abspath(json_file_path), stat.st_mtime_ns, stat.st_size
+            )
+        else:
+            resources = _read_metadata.__wrapped__(json_file_path)
+
+        rel_paths = {name: path for name, path, _ in resources}
+
+        dtypes = {name: dtype for name, _, dtype in resources}
+
+        data = cls._load_csv(cls, dir, rel_paths, lazy=lazy, dtypes=dtypes)
 
         return cls(dir, data, rel_paths)
 
@@ -232,6 +391,9 @@ class EnergyDataPackage(DataFramePackage):
         Infers metadata of the EnergyDataPackage and save it
         in basepath as `datapackage.json`.
         """
+        # load_yaml returns a fresh copy, so updates apply to this call only
+        foreign_keys = load_yaml(os.path.join(module_path, FOREIGN_KEYS))
+
         if foreign_keys_update:
             for key, value in foreign_keys_update.items():
                 if key in foreign_keys:
@@ -241,7 +403,9 @@ class EnergyDataPackage(DataFramePackage):
                     foreign_keys[key] = value
                     print(f"Added foreign key for {key}.")
 
-        infer_metadata(
+        from oemof.tabular.datapackage import building
+
+        building.infer_metadata(
             package_name=self.name,
             path=self.basepath,
             foreign_keys=foreign_keys,
@@ -257,8 +421,9 @@ class EnergyDataPackage(DataFramePackage):
             Name of the DataFrame in the Package.
         column :
             Name of the columns within the DataFrame
-        values : str or numeric
-            Values with the correct index to be set to the DataFrame
+        values : str, numeric or array-like
+            Values with the correct index to be set to the DataFrame. Scalars are
+            broadcast to all rows, so there is no need to build a list of repeated values.
         """
         assert column in self.data[frame].columns, f"Column '{column}' is not defined!"
 
@@ -342,6 +507,8 @@ class ResultsDataPackage(DataFramePackage):
         return data, rel_paths
 
     def _get_sequences(self, es, kind=("bus", "component", "by_variable")):
+        from oemoflex.model.postprocessing import bus_results, component_results
+
         def get_rel_paths(keys, *subdirs, file_ext=".csv"):
             return {key: os.path.join(*subdirs, key + file_ext) for key in keys}
 
@@ -374,37 +541,43 @@ class ResultsDataPackage(DataFramePackage):
 
     @staticmethod
     def _get_seq_by_var(es, results):
+        from oemof.solph.views import convert_to_multiindex
 
-        # copy to avoid manipulating the data in es.results
-        sequences = copy.deepcopy(
-            {
-                key: value["sequences"]
-                for key, value in results.items()
-                if value["sequences"] is not None
-            }
-        )
-
-        sequences = convert_to_multiindex(sequences)
+        sequences = {
+            key: value["sequences"]
+            for key, value in results.items()
+            if value["sequences"] is not None
+        }
 
-        idx = pd.IndexSlice
+        # bucket the sequences by variable, so that one narrow frame is built per
+        # variable instead of one frame of all sequences that is split afterwards
+        buckets = {}
+        for key, value in sequences.items():
+            for variable in value.columns:
+                buckets.setdefault(variable, {})[key] = value[[variable]]
 
-        variables = list(set(sequences.columns.get_level_values(2)))
+        # concatenating all sequences aligned them to the union of their indexes
+        index = None
+        for value in sequences.values():
+            index = value.index if index is None else index.union(value.index)
 
         sequences_by_variable = {}
+        for variable in sorted(buckets):
+            df = convert_to_multiindex(buckets[variable])
 
-        for variable in variables:
+            if not df.index.equals(index):
+                df = df.reindex(index)
 
-            var_results = sequences.loc[:, idx[:, :, variable]]
-
-            sequences_by_variable[variable] = var_results
+            sequences_by_variable[variable] = df
 
         return sequences_by_variable
 
     def _get_scalars(self, es, by_element=False):
+        from oemoflex.model.postprocessing import group_by_element, run_postprocessing
 
         all_scalars = run_postprocessing(es)
 
-        all_scalars = all_scalars[sorted(all_scalars.columns)]
+        all_scalars = _sort_columns(all_scalars)
 
         if by_element:
 
@@ -433,15 +606,20 @@ class ResultsDataPackage(DataFramePackage):
         """
 
         def prepend_index(df, level_name, values):
-            return pd.concat([df], keys=[values], names=[level_name])
+            # replace the index in place, which leaves the data untouched
+            index = df.index
+
+            df.index = pd.MultiIndex.from_arrays(
+                [np.full(len(index), values, dtype=object)]
+                + [index.get_level_values(i) for i in range(index.nlevels)],
+                names=[level_name] + list(index.names),
+            )
 
         assert (
             "scalars" in self.data
         ), "Scenario name can only be set when scalars are stacked."
 
-        self.data["scalars"] = prepend_index(
-            self.data["scalars"], "scenario", scenario_name
-        )
+        prepend_index(self.data["scalars"], "scenario", scenario_name)
 
     def to_element_dfs(self):
         r"""
@@ -477,6 +655,35 @@ class ResultsDataPackage(DataFramePackage):
         )
 
 
+_COMPRESSION_EXTENSIONS = (".gz", ".bz2", ".zip", ".xz", ".zst", ".tar")
+
+# Only string fields are read with a fixed dtype. Typing numeric fields would change
+# how integer columns are parsed and written back.
+_SCHEMA_DTYPES = {"string": str}
+
+
+@lru_cache(maxsize=32)
+def _read_metadata(json_file_path, mtime_ns=None, size=None):
+    r"""
+    Returns the name, path and column dtypes of the resources listed in the metadata.
+    mtime_ns and size are only used as part of the cache key.
+    """
+    from frictionless import Package
+
+    dp = Package(json_file_path)
+
+    def get_dtypes(resource):
+        fields = resource.get("schema", {}).get("fields", [])
+
+        return {
+            field["name"]: _SCHEMA_DTYPES[field["type"]]
+            for field in fields
+            if field.get("type") in _SCHEMA_DTYPES
+        }
+
+    return tuple((r["name"], r["path"], get_dtypes(r)) for r in dp.resources)
+
+
 def _dfp_separate_stacked_frame(dfp, frame_name, target_dir, group_by):
     r"""
     Separates a frame of the DataFramepackage with the structure
@@ -487,11 +694,12 @@ def _dfp_separate_stacked_frame(dfp, frame_name, target_dir, group_by):
         frame_name in dfp.data
     ), f"Cannot group by component if stacked frame {frame_name} is missing."
 
-    frame_to_separate = dfp.data.pop(frame_name)  # pop frame from data
+    # separate first, so that dfp is left unchanged if separating fails
+    separate_dfs = df_separate_pivot(dfp.data[frame_name], separate_by=group_by)
 
-    dfp.rel_paths.pop(frame_name)  # pop path of frame from paths
+    del dfp.data[frame_name]  # remove frame from data
 
-    separate_dfs = df_separate_pivot(frame_to_separate, separate_by=group_by)
+    del dfp.rel_paths[frame_name]  # remove path of frame from paths
 
     dfp.data.update(separate_dfs)  # add separate frames to data
 
@@ -516,38 +724,58 @@ def df_separate_pivot(stacked_frame, separate_by, func_new_frame_name=None):
 
     assert not missing_columns, f"{missing_columns} in {_stacked_frame.columns}"
 
-    def pivot_pandas_0_25_3_compatible(df, index, columns, values):
-        _df = df.copy()
+    if func_new_frame_name is None:
+        # This ain't necessary - it is a convention.
+        def func_new_frame_name(group):
+            return "-".join(group)
+
+    index = [c for c in _stacked_frame.columns if c not in ("var_name", "var_value")]
 
-        _index = list(index)
+    # Pivot all groups at once. Integer values are pivoted as objects, because they
+    # would turn into floats where other groups lack a variable.
+    value_dtype = _stacked_frame["var_value"].dtype
 
-        _index.remove(values)
+    restore_dtypes = value_dtype.kind in "biu"
 
-        _df_piv = _df.set_index(_index).unstack(columns)
+    if restore_dtypes:
+        _stacked_frame["var_value"] = _stacked_frame["var_value"].astype(object)
 
-        _df_piv.columns = _df_piv.columns.droplevel(0)
+    pivoted = _stacked_frame.pivot(index=index, columns="var_name", values="var_value")
 
-        return _df_piv
+    # each group keeps only its own variables, in the order the groups appear
+    var_names_by_group = _stacked_frame.groupby(separate_by, sort=False)[
+        "var_name"
+    ].unique()
 
-    if func_new_frame_name is None:
-        # This ain't necessary - it is a convention.
-        def func_new_frame_name(group):
-            return "-".join(group)
+    positions_by_group = pivoted.groupby(level=separate_by).indices
 
     separated_dfs = {}
-    for group, df in _stacked_frame.groupby(separate_by):
+    for group, var_names in var_names_by_group.items():
+        positions = positions_by_group[group]
+
+        # as when iterating over a groupby, grouping by a list yields tuples as keys,
+        # even if the list has a single element
+        if not isinstance(separate_by, str) and not isinstance(group, tuple):
+            group = (group,)
+
         name = func_new_frame_name(group)
 
-        df = pivot_pandas_0_25_3_compatible(
-            df, index=df.columns, columns="var_name", values="var_value"
-        )
+        df = pivoted.iloc[positions][var_names]
+
+        if restore_dtypes:
+            # as when pivoting each group on its own, missing values within the group
+            # turn all of its columns into floats, or objects for booleans
+            if not df.isna().to_numpy().any():
+                df = df.astype(value_dtype)
+            elif value_dtype.kind != "b":
+                df = df.astype(float)
 
         # set index and sort columns for comparability
         df = df.reset_index()
 
         df = df.set_index("name")
 
-        df = df[sorted(df.columns)]
+        df = _sort_columns(df)
 
         separated_dfs[name] = df
 
@@ -564,17 +792,17 @@ def _dfp_stack_dataframes(
     """
     assert frame_names, "Cannot stack scalars if frames are not in ."
 
-    dfs_to_stack = []
-    for name in frame_names:
-        # pop the frames that should be stacked
-        dfs_to_stack.append(dfp.data.pop(name))
+    dfs_to_stack = [dfp.data[name] for name in frame_names]
 
-        # pop the paths of the frames that should be stacked
-        dfp.rel_paths.pop(name)
-
-    # stack data
+    # stack data first, so that dfp is left unchanged if stacking fails
     stacked_frame = stack_dataframes(dfs_to_stack, vars_to_stack, index_vars)
 
+    for name in frame_names:
+        # remove the frames that have been stacked and their paths
+        del dfp.data[name]
+
+        del dfp.rel_paths[name]
+
     # Write stacked data
     dfp.data[target_name] = stacked_frame
 
@@ -588,23 +816,69 @@ def stack_dataframes(dfs_to_stack, vars_to_stack, index_vars):
     An index is set.
     The columns are sorted.
     """
-    stacked = []
+    # build the long format of all frames directly from their arrays in the
+    # order melt would produce and create a single frame from the result
+    columns = {name: [] for name in [*vars_to_stack, "var_name", "var_value"]}
 
     for df in dfs_to_stack:
 
-        df.reset_index(inplace=True)
+        df = df.reset_index()
+
+        value_vars = [column for column in df.columns if column not in vars_to_stack]
 
-        df = df.melt(vars_to_stack, var_name="var_name", value_name="var_value")
+        if not value_vars:
+            continue
 
-        stacked.append(df)
+        for name in vars_to_stack:
+            columns[name].append(np.tile(df[name].to_numpy(), len(value_vars)))
 
-    stacked_frame = pd.concat(stacked)
+        columns["var_name"].append(
+            np.repeat(np.array(value_vars, dtype=object), len(df))
+        )
+
+        columns["var_value"].append(_melt_values(df[value_vars]))
+
+    stacked_frame = pd.DataFrame(
+        {name: _concat_arrays(arrays) for name, arrays in columns.items()}
+    )
 
     # TODO: Is it necessary to set the index, or could this be performed outside of the function?
     # Maybe it is only done to avoid sorting these in the next step?
     stacked_frame.set_index(index_vars, inplace=True)
 
     # TODO: Is it necessary to sort the columns, and could the order be other than alphabetic?
-    scalars = stacked_frame[sorted(stacked_frame.columns)]
+    return _sort_columns(stacked_frame)
+
+
+def _sort_columns(df):
+    r"""
+    Returns df with alphabetically sorted columns. Already sorted frames are returned
+    as they are.
+    """
+    if df.columns.is_monotonic_increasing:
+        return df
+
+    return df.sort_index(axis=1)
+
+
+def _melt_values(df):
+    r"""
+    Returns the values of all columns of df one after the other, as melt does.
+    """
+    return _concat_arrays([df[column].to_numpy() for column in df.columns])
+
+
+def _concat_arrays(arrays):
+    r"""
+    Concatenates arrays. Arrays of differing dtypes are combined following the
+    rules of pd.concat, which differ from numpy's type promotion (e.g. bool and float).
+    """
+    if not arrays:
+        return np.empty(0, dtype=object)
+
+    if len({array.dtype for array in arrays}) == 1:
+        return np.concatenate(arrays)
 
-    return scalars
+    return pd.concat(
+        [pd.Series(array) for array in arrays], ignore_index=True
+    ).to_numpy()
@@ -1,8 +1,11 @@
 import os
+from collections import ChainMap
+from functools import lru_cache, partial
 
+import numpy as np
 import pandas as pd
 
-from oemoflex.tools.helpers import load_yaml
+from oemoflex.tools.helpers import LazyDict, load_yaml
 
 module_path = os.path.dirname(os.path.abspath(__file__))
 
@@ -20,13 +23,14 @@ class FacadeAttrs:
     ---------
     paths : dict
         Dictionary mapping facade type to absolute paths
-    specs : dict
-        Dictionary mapping facade type to pd.DataFrame containing specs
+    specs : LazyDict
+        Dictionary mapping facade type to pd.DataFrame containing specs. Each file is
+        only read when its facade type is accessed.
     """
 
     def __init__(self, dir_facade_attrs):
         self.paths = {}
-        self.specs = {}
+        self.specs = LazyDict({})
         self.update(dir_facade_attrs)
 
     def get_facade_attr(self, type):
@@ -37,21 +41,36 @@ class FacadeAttrs:
         self._update_specs()
 
     def _update_paths(self, dir_facade_attrs):
-        paths = {
-            os.path.splitext(path)[0]: os.path.join(dir_facade_attrs, path)
-            for path in os.listdir(dir_facade_attrs)
-            if path
-        }
+        with os.scandir(dir_facade_attrs) as entries:
+            paths = {
+                os.path.splitext(entry.name)[0]: entry.path
+                for entry in entries
+                if entry.is_file()
+            }
 
         self.paths.update(paths)
 
     def _update_specs(self):
-        for type, path in self.paths.items():
-            self.specs[type] = pd.read_csv(
-                self.paths[type],
-                index_col=0,
-                header=0,
-            )
+        self.specs = LazyDict(
+            {
+                type: partial(_load_facade_attrs, path)
+                for type, path in self.paths.items()
+            }
+        )
+
+
+def _load_facade_attrs(path):
+    # the parsed file is shared between calls, so a copy is returned
+    return _read_facade_attrs(path, os.stat(path).st_mtime_ns).copy()
+
+
+@lru_cache(maxsize=None)
+def _read_facade_attrs(path, mtime_ns):
+    return pd.read_csv(
+        path,
+        index_col=0,
+        header=0,
+    )
 
 
 def create_default_data(
@@ -115,20 +134,16 @@ def create_default_data(
     rel_paths : dict
         Dictionary containing relative file paths.
     """
-    # load component, bus and facade specifications
-    component_attrs = load_yaml(component_attrs_file)
+    # load component, bus and facade specifications, layered below their updates
+    component_attrs = ChainMap(
+        component_attrs_update or {}, load_yaml(component_attrs_file)
+    )
 
-    bus_attrs = load_yaml(bus_attrs_file)
+    bus_attrs = ChainMap(bus_attrs_update or {}, load_yaml(bus_attrs_file))
 
     facade_attrs = FacadeAttrs(facade_attrs_dir)
 
     # update
-    if component_attrs_update:
-        component_attrs.update(component_attrs_update)
-
-    if bus_attrs_update:
-        bus_attrs.update(bus_attrs_update)
-
     if facade_attrs_update:
         facade_attrs.update(facade_attrs_update)
 
@@ -232,19 +247,18 @@ def create_bus_element(bus_attrs, select_regions):
     bus_df : pd.DataFrame
         Bus element DataFrame
     """
-    regions = []
-    carriers = []
-    balanced = []
-
-    for region in select_regions:
-        for carrier, attrs in bus_attrs.items():
-            regions.append(region)
-            carriers.append(region + "-" + carrier)
-            balanced.append(attrs["balanced"])
-
-    bus_df = pd.DataFrame(
-        {"region": regions, "name": carriers, "type": "bus", "balanced": balanced}
-    )
+    balanced = {carrier: attrs["balanced"] for carrier, attrs in bus_attrs.items()}
+
+    # cross product of regions and carriers, ordered by region first
+    bus_df = pd.MultiIndex.from_product(
+        [select_regions, list(bus_attrs)], names=["region", "carrier"]
+    ).to_frame(index=False)
+
+    bus_df["name"] = bus_df["region"] + "-" + bus_df["carrier"]
+
+    bus_df["type"] = "bus"
+
+    bus_df["balanced"] = bus_df.pop("carrier").map(balanced)
 
     bus_df = bus_df.set_index("name")
 
@@ -272,17 +286,10 @@ def create_component_element(
     # Collect default values and suffices for the component
     foreign_keys = component_attrs["foreign_keys"]
 
-    def pop_keys(dictionary, keys):
-        popped = {}
-
-        for key in keys:
-            popped[key] = dictionary.pop(key)
-
-        return popped
-
     simple = ["carrier", "type", "tech"]
 
-    simple_keys = pop_keys(component_attrs, simple)
+    # the attributes are only read, so they can be passed again, e.g. as updates
+    simple_keys = {key: component_attrs[key] for key in simple}
 
     defaults = {}
     if "defaults" in component_attrs:
@@ -296,37 +303,41 @@ def create_component_element(
     comp_data.update(simple_keys)
 
     # Create dict for component data
+    suffix = "-" + simple_keys["carrier"] + "-" + simple_keys["tech"]
+
     if simple_keys["type"] == "link":
+        links = np.asarray(select_links, dtype=object)
+
+        # split each link into the regions it connects only once
+        link_regions = [link.split("-") for link in select_links]
+
+        from_regions = np.asarray([pair[0] for pair in link_regions], dtype=object)
+
+        to_regions = np.asarray([pair[1] for pair in link_regions], dtype=object)
+
         # TODO: Check the diverging conventions of '-' and '_' and think about unifying.
         comp_data["region"] = [link.replace("-", "_") for link in select_links]
-        comp_data["name"] = [
-            "-".join([link, simple_keys["carrier"], simple_keys["tech"]])
-            for link in select_links
-        ]
-        comp_data["from_bus"] = [
-            link.split("-")[0] + "-" + foreign_keys["from_bus"] for link in select_links
-        ]
-        comp_data["to_bus"] = [
-            link.split("-")[1] + "-" + foreign_keys["to_bus"] for link in select_links
-        ]
+        comp_data["name"] = links + suffix
+        comp_data["from_bus"] = from_regions + ("-" + foreign_keys["from_bus"])
+        comp_data["to_bus"] = to_regions + ("-" + foreign_keys["to_bus"])
 
     else:
+        regions = np.asarray(select_regions, dtype=object)
+
         comp_data["region"] = select_regions
-        comp_data["name"] = [
-            "-".join([region, simple_keys["carrier"], simple_keys["tech"]])
-            for region in select_regions
-        ]
+        comp_data["name"] = regions + suffix
 
         for key, value in foreign_keys.items():
-            comp_data[key] = [region + "-" + value for region in select_regions]
+            comp_data[key] = regions + ("-" + value)
 
     for key, value in defaults.items():
         comp_data[key] = value
 
-    # sort the columns for comparability
-    component_df = pd.DataFrame(comp_data).set_index("name")
-
-    component_df = component_df[sorted(component_df.columns)]
+    # create the columns in sorted order for comparability
+    component_df = pd.DataFrame(
+        {key: comp_data[key] for key in sorted(comp_data) if key != "name"},
+        index=pd.Index(comp_data["name"], name="name"),
+    )
 
     return component_df
 
@@ -368,6 +379,15 @@ def create_component_sequences(
 
     profile_data = {}
 
+    # all dummy profiles share the same short timeindex
+    if dummy_sequences:
+        datetimeindex = pd.date_range(start="2020-10-20", periods=3, freq="H")
+
+        dummy_msg = "dummy"
+
+    else:
+        dummy_msg = "empty"
+
     for profile_name in profile_names.values():
 
         profile_columns = []
@@ -377,18 +397,16 @@ def create_component_sequences(
         )
 
         if dummy_sequences:
-            datetimeindex = pd.date_range(start="2020-10-20", periods=3, freq="H")
-
             profile_df = pd.DataFrame(
                 dummy_value, index=datetimeindex, columns=profile_columns
             )
 
-            dummy_msg = "dummy"
-
         else:
-            profile_df = pd.DataFrame(columns=profile_columns, index=datetimeindex)
-
-            dummy_msg = "empty"
+            # float columns keep each profile in one contiguous block that can be
+            # parametrized in place, while object columns would box every value
+            profile_df = pd.DataFrame(
+                columns=profile_columns, index=datetimeindex, dtype=float
+            )
 
         profile_df.index.name = "timeindex"
 
@@ -1,5 +1,6 @@
 import copy
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 
 class VariationGenerator:
@@ -7,22 +8,82 @@ class VariationGenerator:
 
         self.base_datapackage = datapackage
 
-    def create_variations(self, variations, destination):
+    def create_variations(self, variations, destination, max_workers=1):
+        r"""
+        Creates a variation of the base datapackage for each row of variations and saves it
+        to a subdirectory of destination named after the row's index.
 
-        for id, changes in variations.iterrows():
+        Parameters
+        ----------
+        variations : pandas.DataFrame
+            Changes to apply, with columns (resource, var_name) and one row per variation.
+        destination : str
+            Path to store the variations to.
+        max_workers : int
+            Number of processes to create variations in parallel. None uses the number of
+            processors. When running in parallel, the calling script needs an
+            `if __name__ == "__main__":` guard.
+        """
+        variation_dirs = [os.path.join(destination, str(id)) for id in variations.index]
 
-            dp = self.create_var(self.base_datapackage, changes)
+        all_changes = [changes for _, changes in variations.iterrows()]
 
-            variation_dir = os.path.join(destination, str(id))
+        if max_workers == 1:
+            for changes, variation_dir in zip(all_changes, variation_dirs):
+                self._save_var(changes, variation_dir)
 
-            dp.to_csv_dir(variation_dir)
+            return
 
-    def create_var(self, dp, changes):
+        n_workers = max_workers or os.cpu_count()
 
-        _dp = copy.deepcopy(dp)
+        # pickle the base datapackage once per worker instead of once per variation
+        chunksize = max(1, -(-len(all_changes) // n_workers))
+
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            list(
+                executor.map(
+                    self._save_var, all_changes, variation_dirs, chunksize=chunksize
+                )
+            )
+
+    def _save_var(self, changes, variation_dir):
+
+        dp = self.create_var(self.base_datapackage, changes, share_unchanged=True)
+
+        dp.to_csv_dir(variation_dir)
+
+    def create_var(self, dp, changes, share_unchanged=False):
+        r"""
+        Creates a variation of dp by applying changes.
+
+        Parameters
+        ----------
+        dp : oemoflex.model.datapackage.DataFramePackage
+            Datapackage to vary, which is left unchanged.
+        changes : pandas.Series
+            Values to set, indexed by (resource, var_name).
+        share_unchanged : bool
+            If True, frames that are not changed are shared with dp instead of being
+            copied. The variation must then not be modified in place, which holds for
+            variations that are only saved.
+        """
+        _dp = copy.copy(dp)
+
+        _dp.data = dict(dp.data)
+
+        # stacking or separating frames changes rel_paths, so it must not be shared
+        _dp.rel_paths = dict(dp.rel_paths)
 
         changes = changes.to_dict()
 
+        if share_unchanged:
+            resources_to_copy = {resource for resource, _ in changes}
+        else:
+            resources_to_copy = _dp.data.keys()
+
+        for resource in resources_to_copy:
+            _dp.data[resource] = copy.deepcopy(_dp.data[resource])
+
         for (resource, var_name), var_value in changes.items():
 
             _dp.data[resource].loc[:, var_name] = var_value
@@ -1,13 +1,94 @@
+import copy
 import os
+from collections.abc import MutableMapping
+from functools import lru_cache
+
 import yaml
 
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
 
+class LazyDict(MutableMapping):
+    r"""
+    Dictionary whose values are loaded on first access. It is initialized with functions
+    without arguments, which are called once when their key is accessed. Their result
+    replaces them. Iterating over keys does not load any values.
+
+    Parameters
+    ----------
+    loaders : dict
+        Functions that return the values, by key
+    """
+
+    def __init__(self, loaders):
+        self._data = dict(loaders)
+
+        self._loaded = set()
+
+    def __getitem__(self, key):
+        value = self._data[key]
+
+        if key not in self._loaded:
+            value = value()
+            self._data[key] = value
+            self._loaded.add(key)
+
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+
+        self._loaded.add(key)
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+        self._loaded.discard(key)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self._data)})"
+
+
+# the C implementation of the loader is used if PyYAML is built with libyaml
+_YAML_LOADER = getattr(yaml, "CFullLoader", yaml.FullLoader)
+
+
 def load_yaml(file_path):
+    r"""
+    Loads a yaml file. Files are parsed once per modification and the parsed data is
+    cached, each call returns a copy of it that can be changed freely.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the yaml file
+
+    Returns
+    -------
+    yaml_data : object
+        Content of the yaml file
+    """
+    file_path = os.path.abspath(file_path)
+
+    yaml_data = _load_yaml(file_path, os.stat(file_path).st_mtime_ns)
+
+    return copy.deepcopy(yaml_data)
+
+
+@lru_cache(maxsize=None)
+def _load_yaml(file_path, mtime_ns):
     with open(file_path, "r") as yaml_file:
-        yaml_data = yaml.load(yaml_file, Loader=yaml.FullLoader)
+        yaml_data = yaml.load(yaml_file, Loader=_YAML_LOADER)
 
     return yaml_data
 
@@ -25,6 +25,36 @@ for i in colors_csv.columns:
     default_colors_odict[i] = colors_csv.loc["Color", i]
 
 
+def load_bus_sequences(path):
+    r"""
+    Loads the sequences of a bus as saved by ResultsDataPackage. The columns have three
+    levels (from, to, type) and the first column holds the timeindex.
+
+    The pyarrow engine cannot parse multi-row headers, so the c engine is used with
+    cached date conversion.
+
+    Parameters
+    ---------------
+    path : str
+        Path to the csv file with the bus sequences.
+
+    Returns
+    ----------
+    df : pandas.DataFrame
+        DataFrame with DatetimeIndex and MultiIndex columns.
+    """
+    df = pd.read_csv(
+        path,
+        header=[0, 1, 2],
+        index_col=0,
+        parse_dates=[0],
+        cache_dates=True,
+        engine="c",
+    )
+
+    return df
+
+
 def map_labels(df, labels_dict=None):
     r"""
     Renames columns according to the specifications in the label_dict. The data has multilevel
@@ -189,7 +219,7 @@ def _group_agg_by_column(df):
     df_grouped : pandas.DataFrame
         Dataframe with grouped data.
     """
-    df_grouped = df.groupby(by=df.columns, axis=1).sum()
+    df_grouped = df.T.groupby(level=0).sum().T
 
     return df_grouped
 
@@ -209,7 +239,14 @@ def _replace_near_zeros(df, tolerance=1e-3):
     df : pandas.DataFrame
         DataFrame with replaced near zeros.
     """
-    df[abs(df) < tolerance] = 0.0
+    values = df.to_numpy()
+
+    df = pd.DataFrame(
+        np.where(np.abs(values) < tolerance, 0, values),
+        index=df.index,
+        columns=df.columns,
+    )
+
     return df
 
 
@@ -238,20 +275,24 @@ def prepare_dispatch_data(df, bus_name, demand_name, labels_dict=None):
     df_demand: pandas.DataFrame
         DataFrame with prepared data for dispatch plotting of demand.
     """
-    _df = df.copy()
-
     if labels_dict is None:
         labels_dict = default_labels_dict
 
-    # identify consumers, which shall be plotted negative and
+    columns = df.columns.to_flat_index()
+
+    # identify consumers, which shall be plotted negative, and flip their sign in one pass
+    is_consumer = np.array([column[0] == bus_name for column in columns])
+    values = df.to_numpy()
+    _df = pd.DataFrame(
+        np.where(is_consumer, -values, values),
+        index=df.index,
+        columns=columns,
+    )
+
     # isolate column with demand and make its data positive again
-    _df.columns = _df.columns.to_flat_index()
-    for i in _df.columns:
-        if i[0] == bus_name:
-            _df[i] = _df[i] * -1
-        if demand_name in i[1]:
-            df_demand = (_df[i] * -1).to_frame()
-            _df.drop(columns=[i], inplace=True)
+    is_demand = np.array([demand_name in column[1] for column in columns])
+    df_demand = -_df.loc[:, is_demand].iloc[:, [-1]]
+    _df = _df.loc[:, ~is_demand]
 
     # rename column names to match labels
     _df = map_labels(_df, labels_dict)
@@ -274,7 +315,7 @@ def filter_timeseries(df, start_date=None, end_date=None):
     Parameters
     ---------------
     df : pandas.DataFrame
-        Dataframe with timeseries.
+        Dataframe with timeseries. The index has to be sorted in increasing order.
     start_date : string
         String with the start date for filtering in the format 'YYYY-MM-DD hh:mm:ss'.
     end_date : string
@@ -286,12 +327,100 @@ def filter_timeseries(df, start_date=None, end_date=None):
         Filtered dataframe.
     """
     assert isinstance(df.index, pd.DatetimeIndex), "Index should be DatetimeIndex"
-    df_filtered = df.copy()
-    df_filtered = df_filtered.loc[start_date:end_date]
+    assert (
+        df.index.is_monotonic_increasing
+    ), "Index should be sorted in increasing order"
+
+    # slicing a sorted index is a binary search; only the selected rows are copied
+    df_filtered = df.loc[start_date:end_date].copy()
 
     return df_filtered
 
 
+def _lttb_indices(x, y, n_out):
+    r"""
+    Selects n_out points of a series with the Largest-Triangle-Three-Buckets algorithm.
+    The first and the last point are always kept. In between, the points are split into
+    buckets and from each bucket the point is chosen that forms the largest triangle with
+    the point chosen before and the average of the next bucket.
+
+    Parameters
+    ---------------
+    x : numpy.ndarray
+        Increasing x-values.
+    y : numpy.ndarray
+        y-values.
+    n_out : int
+        Number of points to select. Has to be at least 3.
+
+    Returns
+    ----------
+    indices : numpy.ndarray
+        Sorted positions of the selected points.
+    """
+    n = len(x)
+
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(int)
+
+    indices = np.empty(n_out, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # average of the next bucket, which is the last point for the last bucket
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+
+        a = start + np.argmax(area)
+        indices[i + 1] = a
+
+    return indices
+
+
+def _downsample_timeseries(df, max_samples):
+    r"""
+    Reduces a timeseries to at most max_samples rows using the Largest-Triangle-Three-Buckets
+    algorithm, which keeps peaks and the visual shape of the series. The rows are selected
+    based on the stacked total of all columns and applied to all columns, so stacked data
+    stays consistent.
+
+    Parameters
+    ---------------
+    df : pandas.DataFrame
+        Dataframe with timeseries.
+    max_samples : int
+        Maximum number of rows. Has to be at least 3.
+
+    Returns
+    ----------
+    df_downsampled : pandas.DataFrame
+        Downsampled dataframe.
+    """
+    if max_samples < 3:
+        raise ValueError(f"max_samples has to be at least 3, got {max_samples}.")
+
+    if len(df) <= max_samples:
+        return df
+
+    x = df.index.asi8.astype(float)
+
+    # absolute values cover the positive and the negative stack
+    y = np.abs(df.to_numpy(dtype=float)).sum(axis=1)
+
+    df_downsampled = df.iloc[_lttb_indices(x, y, max_samples)]
+
+    return df_downsampled
+
+
 def _assign_stackgroup(key, values):
     r"""
     This function decides if data is supposed to be plotted on the positive or negative side of
@@ -309,11 +438,9 @@ def _assign_stackgroup(key, values):
     stackgroup : string
         String with keyword positive or negative.
     """
-    if all(values <= 0):
+    if (values <= 0).all():
         stackgroup = "negative"
-    elif all(values >= 0):
-        stackgroup = "positive"
-    elif all(values == 0):
+    elif (values >= 0).all():
         stackgroup = "positive"
     else:
         raise ValueError(
@@ -324,7 +451,7 @@ def _assign_stackgroup(key, values):
     return stackgroup
 
 
-def stackplot(ax, df, colors_odict):
+def stackplot(ax, df, colors_odict, rasterized=False):
     r"""
     Plots data as a stackplot. The stacking order is determined by the order
     of labels in the colors_odict. It is stacked beginning with the x-axis as
@@ -338,27 +465,20 @@ def stackplot(ax, df, colors_odict):
         Dataframe with data.
     colors_odict : collections.OrderedDictionary
         Ordered dictionary with labels as keys and colourcodes as values.
+    rasterized : bool
+        Draw the filled areas as raster images when saving to vector formats, which
+        keeps files of long timeseries small. Default: False.
     """
     assert not df.empty, "Dataframe is empty."
 
     _check_undefined_colors(df.columns, colors_odict.keys())
 
-    # y is a list which gets the correct stack order from colors file
-    colors = []
-    labels = []
-    y = []
-
-    order = list(colors_odict)
-
-    for i in order:
-        if i not in df.columns:
-            continue
-        labels.append(i)
-        colors.append(colors_odict[i])
-        y.append(df[i])
+    # labels get the correct stack order from colors file
+    labels = [i for i in colors_odict if i in df.columns]
+    colors = [colors_odict[i] for i in labels]
 
-    y = np.vstack(y)
-    ax.stackplot(df.index, y, colors=colors, labels=labels)
+    y = df[labels].to_numpy().T
+    ax.stackplot(df.index, y, colors=colors, labels=labels, rasterized=rasterized)
 
 
 def lineplot(ax, df, colors_odict, linewidth=1):
@@ -382,7 +502,9 @@ def lineplot(ax, df, colors_odict, linewidth=1):
         ax.plot(df.index, df[i], color=colors_odict[i], linewidth=linewidth, label=i)
 
 
-def plot_dispatch(ax, df, df_demand, unit, colors_odict=None, linewidth=1):
+def plot_dispatch(
+    ax, df, df_demand, unit, colors_odict=None, linewidth=1, rasterized=False
+):
     r"""
     Plots data as a dispatch plot. The demand is plotted as a line plot and
     suppliers and other consumers are plotted with a stackplot. Columns with negative vlaues
@@ -402,6 +524,9 @@ def plot_dispatch(ax, df, df_demand, unit, colors_odict=None, linewidth=1):
         Ordered dictionary with labels as keys and colourcodes as values.
     linewidth: float
         Width of the line - set by default to 1.
+    rasterized : bool
+        Draw the stacked areas as raster images when saving to vector formats.
+        Default: False.
     """
     assert not df.empty, "DataFrame is empty. Cannot plot empty data."
     assert (
@@ -428,17 +553,13 @@ def plot_dispatch(ax, df, df_demand, unit, colors_odict=None, linewidth=1):
         elif stackgroup == "positive":
             y_stack_pos.append(key)
 
-    for i in y_stack_pos:
-        if df[i].isin([0]).all():
-            y_stack_pos.remove(i)
-
     # plot if there is positive data
     if not df[y_stack_pos].empty:
-        stackplot(ax, df[y_stack_pos], colors_odict)
+        stackplot(ax, df[y_stack_pos], colors_odict, rasterized)
 
     # plot if there is negative data
     if not df[y_stack_neg].empty:
-        stackplot(ax, df[y_stack_neg], colors_odict)
+        stackplot(ax, df[y_stack_neg], colors_odict, rasterized)
 
     # plot lineplot (demand)
     lineplot(ax, df_demand, colors_odict, linewidth)
@@ -449,11 +570,15 @@ def plot_dispatch_plotly(
     df_demand,
     unit,
     colors_odict=None,
+    max_samples=None,
 ):
     r"""
     Plots data as a dispatch plot in an interactive plotly plot. The demand is plotted as a
     line plot and suppliers and other consumers are plotted with a stackplot.
 
+    Every sample is embedded in the figure, which makes long timeseries slow to render in the
+    browser. Pass max_samples to reduce the number of samples per trace.
+
     Parameters
     ---------------
     df : pandas.DataFrame
@@ -464,6 +589,10 @@ def plot_dispatch_plotly(
         String with unit sign of plotted data on y-axis.
     colors_odict : collections.OrderedDictionary
         Ordered dictionary with labels as keys and colourcodes as values.
+    max_samples : int
+        Maximum number of samples per trace. Longer timeseries are downsampled with the
+        Largest-Triangle-Three-Buckets algorithm. The demand is plotted at the samples
+        selected for the stack. Has to be at least 3. By default, all samples are plotted.
 
     Returns
     ----------
@@ -483,6 +612,11 @@ def plot_dispatch_plotly(
             concrete_order.remove(i)
     df = df[concrete_order]
 
+    if max_samples is not None:
+        df = _downsample_timeseries(df, max_samples)
+        # plot the demand at the same samples, so that it meets the top of the stack
+        df_demand = df_demand.loc[df.index]
+
     # plotly figure
     fig = go.Figure()
 
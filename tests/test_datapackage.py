@@ -1,12 +1,20 @@
 import os
 import json
-from shutil import rmtree
+from shutil import copytree, rmtree
+
+import pandas as pd
+import pytest
 
 from oemof.solph.helpers import extend_basic_path
 import oemof.tabular
 
-from oemoflex.model.datapackage import DataFramePackage, EnergyDataPackage
-from oemoflex.tools.helpers import check_if_csv_dirs_equal
+from oemoflex.model.datapackage import (
+    DataFramePackage,
+    EnergyDataPackage,
+    LazyDict,
+    df_separate_pivot,
+)
+from oemoflex.tools.helpers import check_if_csv_dirs_equal, load_yaml
 
 
 def clean_path(path):
@@ -29,6 +37,38 @@ def test_datapackage():
     assert dfp.rel_paths == rel_paths
 
 
+def test_datapackage_from_csv_dir_lazy():
+
+    dir = os.path.join(os.path.dirname(__file__), "_files", "default_edp")
+
+    dfp = DataFramePackage.from_csv_dir(dir)
+
+    dfp_lazy = DataFramePackage.from_csv_dir(dir, lazy=True)
+
+    assert isinstance(dfp_lazy.data, LazyDict)
+
+    assert list(dfp_lazy.data) == list(dfp.data)
+
+    assert not dfp_lazy.data._loaded
+
+    pd.testing.assert_frame_equal(dfp_lazy.data["bus"], dfp.data["bus"])
+
+    assert dfp_lazy.data._loaded == {"bus"}
+
+
+def test_lazy_dict_contains_does_not_load():
+    def loader():
+        raise AssertionError("loader must not be called")
+
+    lazy_dict = LazyDict({"a": loader})
+
+    assert "a" in lazy_dict
+
+    assert "b" not in lazy_dict
+
+    assert not lazy_dict._loaded
+
+
 def test_edp():
     EnergyDataPackage(basepath="path", data={}, rel_paths={})
 
@@ -196,6 +236,32 @@ def test_edp_setup_default_with_updates(monkeypatch):
     assert sorted(foreign_keys_fuel_cell) == sorted(foreign_keys_expected)
 
 
+def test_edp_infer_metadata_keeps_default_foreign_keys(monkeypatch):
+    import oemoflex.model.datapackage as datapackage
+    from oemof.tabular.datapackage import building
+
+    used_foreign_keys = []
+
+    def infer_metadata(package_name, path, foreign_keys):
+        used_foreign_keys.append(foreign_keys)
+
+    monkeypatch.setattr(building, "infer_metadata", infer_metadata)
+
+    edp = EnergyDataPackage(basepath=None, data={}, rel_paths={}, name="test_edp")
+
+    edp.infer_metadata(foreign_keys_update={"fuel_cell": ["h2-fuel_cell"]})
+
+    edp.infer_metadata()
+
+    assert "fuel_cell" in used_foreign_keys[0]
+
+    assert used_foreign_keys[1] == load_yaml(
+        os.path.join(datapackage.module_path, datapackage.FOREIGN_KEYS)
+    )
+
+    assert "fuel_cell" not in used_foreign_keys[1]
+
+
 def test_edp_stack_unstack():
 
     tmp = extend_basic_path("tmp")
@@ -230,3 +296,190 @@ def test_edp_stack_unstack():
     edp.to_csv_dir(after, overwrite=True)
 
     check_if_csv_dirs_equal(before, after)
+
+
+def test_edp_to_parquet_dir():
+    pytest.importorskip("pyarrow")
+
+    tmp = extend_basic_path("tmp")
+    destination = os.path.join(tmp, "parquet")
+
+    edp = EnergyDataPackage.setup_default(
+        name="test_edp",
+        components=["ch4-gt", "electricity-demand"],
+        busses=["ch4", "electricity"],
+        basepath=None,
+        datetimeindex=pd.date_range("1/1/2016", periods=3, freq="H"),
+        regions=["A", "B"],
+        links=["A-B"],
+    )
+
+    edp.parametrize("ch4-gt", "capacity", [10, 12])
+
+    for compression in ["snappy", "zstd", None]:
+        edp.to_parquet_dir(destination, overwrite=True, compression=compression)
+
+        for name, rel_path in edp.rel_paths.items():
+            path = os.path.join(destination, os.path.splitext(rel_path)[0] + ".parquet")
+
+            pd.testing.assert_frame_equal(
+                pd.read_parquet(path),
+                edp.data[name],
+                check_dtype=False,
+                check_freq=False,
+            )
+
+
+def test_edp_from_parquet_dir():
+    pytest.importorskip("pyarrow")
+
+    tmp = extend_basic_path("tmp")
+    destination = os.path.join(tmp, "parquet_roundtrip")
+
+    edp = EnergyDataPackage.setup_default(
+        name="test_edp",
+        components=["ch4-gt", "electricity-demand"],
+        busses=["ch4", "electricity"],
+        basepath=None,
+        datetimeindex=pd.date_range("1/1/2016", periods=3, freq="H"),
+        regions=["A", "B"],
+        links=["A-B"],
+    )
+
+    edp.to_parquet_dir(destination, overwrite=True)
+
+    dfp = DataFramePackage.from_parquet_dir(destination)
+
+    assert len(dfp.data) == len(edp.data)
+
+    for name, rel_path in dfp.rel_paths.items():
+        assert rel_path.endswith(".parquet")
+
+        pd.testing.assert_frame_equal(
+            dfp.data[name], pd.read_parquet(os.path.join(destination, rel_path))
+        )
+
+
+def test_edp_to_csv_dir_overwrite_leaves_no_trash(monkeypatch):
+    import shutil
+    import threading
+
+    from oemoflex.model.datapackage import TRASH_PREFIX
+
+    tmp = extend_basic_path("tmp")
+    parent = os.path.join(tmp, "overwrite")
+    destination = os.path.join(parent, "data")
+
+    clean_path(parent)
+
+    # hold back the deletion of the old data until it is released
+    rmtree_original = shutil.rmtree
+    release = threading.Event()
+    deleted = threading.Event()
+    deletions = []
+
+    def rmtree(path, *args, **kwargs):
+        deletions.append((path, threading.current_thread()))
+        release.wait(10)
+        rmtree_original(path, *args, **kwargs)
+        deleted.set()
+
+    monkeypatch.setattr(shutil, "rmtree", rmtree)
+
+    edp = EnergyDataPackage.setup_default(
+        name="test_edp",
+        components=["ch4-gt", "electricity-demand"],
+        busses=["ch4", "electricity"],
+        basepath=None,
+        datetimeindex=pd.date_range("1/1/2016", periods=3, freq="H"),
+        regions=["A", "B"],
+        links=["A-B"],
+    )
+
+    edp.to_csv_dir(destination)
+
+    edp.parametrize("ch4-gt", "capacity", [10, 12])
+
+    edp.to_csv_dir(destination, overwrite=True)
+
+    # the old data has been moved to a trash directory next to the destination,
+    # which is deleted in the background and not read as part of the parent
+    ((trash, thread),) = deletions
+
+    assert os.path.dirname(trash) == os.path.normpath(parent)
+
+    assert os.path.basename(trash).startswith(TRASH_PREFIX)
+
+    assert thread is not threading.main_thread()
+
+    dfp = DataFramePackage.from_csv_dir(parent)
+
+    assert all(
+        rel_path.startswith("data" + os.sep) for rel_path in dfp.rel_paths.values()
+    )
+
+    release.set()
+
+    assert deleted.wait(10)
+
+    assert os.listdir(parent) == ["data"]
+
+    dfp = DataFramePackage.from_csv_dir(destination)
+
+    assert dfp.data["ch4-gt"]["capacity"].tolist() == [10, 12]
+
+
+def test_datapackage_lazy_to_csv_dir_overwrite_own_dir():
+
+    tmp = extend_basic_path("tmp")
+    destination = os.path.join(tmp, "lazy_overwrite")
+
+    clean_path(destination)
+
+    copytree(
+        os.path.join(os.path.dirname(__file__), "_files", "default_edp"), destination
+    )
+
+    dfp = DataFramePackage.from_csv_dir(destination)
+
+    dfp_lazy = DataFramePackage.from_csv_dir(destination, lazy=True)
+
+    dfp_lazy.to_csv_dir(destination, overwrite=True)
+
+    dfp_written = DataFramePackage.from_csv_dir(destination)
+
+    assert list(dfp_written.data) == list(dfp.data)
+
+    for name, df in dfp.data.items():
+        pd.testing.assert_frame_equal(dfp_written.data[name], df)
+
+
+def test_df_separate_pivot_dtypes():
+    # group "a" lacks the variable "q" for "a2"
+    stacked_frame = pd.DataFrame(
+        {
+            "name": ["a1", "a1", "a2", "b1", "b1"],
+            "type": ["a", "a", "a", "b", "b"],
+            "var_name": ["p", "q", "p", "p", "q"],
+            "var_value": [1, 2, 3, 4, 5],
+        }
+    ).set_index("name")
+
+    separated = df_separate_pivot(stacked_frame, "type")
+
+    # as for pivoting each group on its own, missing values turn the whole group into
+    # floats, while complete groups keep their integers
+    assert (separated["a"][["p", "q"]].dtypes == "float64").all()
+
+    assert (separated["b"][["p", "q"]].dtypes == "int64").all()
+
+    # a single key given as a list is joined as a whole, not by its characters
+    separated = df_separate_pivot(
+        stacked_frame.replace({"type": {"a": "el", "b": "heat"}}), ["type"]
+    )
+
+    assert set(separated) == {"el", "heat"}
+
+    assert (separated["el"][["p", "q"]].dtypes == "float64").all()
+
+    assert (separated["heat"][["p", "q"]].dtypes == "int64").all()
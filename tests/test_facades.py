@@ -0,0 +1,78 @@
+import pytest
+
+from oemof.solph import Bus
+
+from oemoflex.facades import AsymmetricStorage, ExtractionTurbine
+
+
+def test_asymmetric_storage_expandable_without_capacity_cost():
+
+    bus = Bus(label="electricity")
+
+    with pytest.raises(ValueError, match="storage_capacity_cost"):
+        AsymmetricStorage(
+            label="storage",
+            bus=bus,
+            carrier="electricity",
+            tech="storage",
+            expandable=True,
+            capacity_cost_charge=1,
+            capacity_cost_discharge=1,
+        )
+
+
+def test_asymmetric_storage_nominal_value():
+    # skip construction, which the pinned oemof.solph does not support
+    storage = AsymmetricStorage.__new__(AsymmetricStorage)
+    storage.capacity_charge = 1
+    storage.capacity_discharge = 2
+
+    storage.expandable = False
+
+    assert storage._nominal_value() == {"charge": 1, "discharge": 2}
+
+    storage.expandable = True
+
+    assert storage._nominal_value() is None
+
+
+def test_extraction_turbine_expandable_not_implemented():
+
+    with pytest.raises(NotImplementedError):
+        ExtractionTurbine(
+            label="chp",
+            carrier="ch4",
+            tech="extraction",
+            fuel_bus=Bus(label="ch4"),
+            electricity_bus=Bus(label="electricity"),
+            heat_bus=Bus(label="heat"),
+            expandable=True,
+            condensing_efficiency=0.5,
+            electric_efficiency=0.4,
+            thermal_efficiency=0.35,
+        )
+
+
+def test_extraction_turbine_zero_condensing_efficiency():
+
+    with pytest.raises(ValueError, match="condensing_efficiency"):
+        ExtractionTurbine(
+            label="chp",
+            carrier="ch4",
+            tech="extraction",
+            fuel_bus=Bus(label="ch4"),
+            electricity_bus=Bus(label="electricity"),
+            heat_bus=Bus(label="heat"),
+            capacity=100,
+            condensing_efficiency=0,
+            electric_efficiency=0.4,
+            thermal_efficiency=0.35,
+        )
+
+
+def test_facades_reexport_link():
+    # postprocessing.map_var_names imports Link from oemoflex.facades
+    from oemof.tabular.facades import Link as TabularLink
+    from oemoflex.facades import Link
+
+    assert Link is TabularLink
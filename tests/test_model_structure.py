@@ -3,6 +3,7 @@ import os
 import pandas as pd
 
 from oemoflex.model.model_structure import create_default_data, FacadeAttrs
+from oemoflex.tools.helpers import LazyDict
 
 import oemoflex.model
 
@@ -30,3 +31,42 @@ def test_facade_attrs_update():
     facade_attrs.update(facade_attrs_dir)
 
     assert isinstance(facade_attrs.specs["load"], pd.DataFrame)
+
+
+def test_facade_attrs_lazy():
+    facade_attrs_dir = os.path.join(oemoflex.model.__path__[0], "facade_attrs")
+    facade_attrs = FacadeAttrs(facade_attrs_dir)
+
+    assert isinstance(facade_attrs.specs, LazyDict)
+
+    load = facade_attrs.get_facade_attr("load")
+
+    load.drop(load.index, inplace=True)
+
+    # modifying a loaded spec does not affect other instances
+    assert not FacadeAttrs(facade_attrs_dir).get_facade_attr("load").empty
+
+
+def test_default_data_keeps_updates():
+    component_attrs_update = {
+        "h2-gt": {
+            "carrier": "h2",
+            "tech": "gt",
+            "type": "conversion",
+            "foreign_keys": {"from_bus": "h2", "to_bus": "electricity"},
+            "defaults": {"output_parameters": "{}"},
+        },
+    }
+
+    # the updates are not changed and can be used again
+    for _ in range(2):
+        data, rel_paths = create_default_data(
+            select_regions=["A", "B"],
+            select_links=["A-B"],
+            select_components=["h2-gt"],
+            component_attrs_update=component_attrs_update,
+        )
+
+        assert data["h2-gt"].loc["A-h2-gt", "carrier"] == "h2"
+
+    assert component_attrs_update["h2-gt"]["carrier"] == "h2"
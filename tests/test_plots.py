@@ -1,5 +1,6 @@
 from oemoflex.tools import plots
 import pandas as pd
+import pytest
 
 
 def test_group_agg_by_column():
@@ -12,3 +13,59 @@ def test_group_agg_by_column():
 
     # Check if df_agg is the same as expected
     pd.testing.assert_frame_equal(df_agg, df_agg_default)
+
+
+def test_load_bus_sequences(tmp_path):
+    columns = pd.MultiIndex.from_tuples(
+        [
+            ("A-ch4-gt", "A-electricity", "flow"),
+            ("A-electricity", "A-electricity-demand", "flow"),
+            ("B-electricity", "A-electricity", "flow"),
+        ],
+        names=["from", "to", "type"],
+    )
+    index = pd.date_range("2016-01-01", periods=3, freq="h", name="timeindex")
+    df = pd.DataFrame([[1.0, 2.0, 3.0]] * 3, index=index, columns=columns)
+
+    path = tmp_path / "A-electricity.csv"
+    df.to_csv(path)
+
+    df_loaded = plots.load_bus_sequences(path)
+
+    pd.testing.assert_frame_equal(df_loaded, df, check_freq=False)
+
+
+def test_downsample_timeseries_keeps_peaks():
+    index = pd.date_range("2016-01-01", periods=1000, freq="h")
+    df = pd.DataFrame({"A": 1.0, "B": -1.0}, index=index)
+    df.iloc[417] = [10.0, -5.0]
+
+    df_downsampled = plots._downsample_timeseries(df, 50)
+
+    assert len(df_downsampled) == 50
+    assert df_downsampled.index.is_monotonic_increasing
+    assert df_downsampled.index[[0, -1]].equals(index[[0, -1]])
+    assert index[417] in df_downsampled.index
+    pd.testing.assert_frame_equal(df_downsampled, df.loc[df_downsampled.index])
+
+
+def test_downsample_timeseries_rejects_too_few_samples():
+    index = pd.date_range("2016-01-01", periods=10, freq="h")
+    df = pd.DataFrame({"A": 1.0}, index=index)
+
+    for max_samples in [0, 1, 2]:
+        with pytest.raises(ValueError):
+            plots._downsample_timeseries(df, max_samples)
+
+
+def test_plot_dispatch_plotly_samples_demand_with_stack():
+    index = pd.date_range("2016-01-01", periods=100, freq="h")
+    df = pd.DataFrame({"CH4 GT": 1.0, "Import": 2.0}, index=index)
+    df.iloc[42] = [10.0, 5.0]
+    df_demand = pd.DataFrame({"El. demand": 3.0}, index=index)
+    df_demand.iloc[71] = 20.0
+
+    fig = plots.plot_dispatch_plotly(df, df_demand, unit="W", max_samples=10)
+
+    for trace in fig.data:
+        assert list(trace.x) == list(fig.data[0].x)
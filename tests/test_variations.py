@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from oemoflex.model.datapackage import EnergyDataPackage
+from oemoflex.model.variations import VariationGenerator
+
+
+@pytest.mark.parametrize("share_unchanged", [False, True])
+def test_create_var_keeps_base_unchanged(share_unchanged):
+    edp = EnergyDataPackage.setup_default(
+        name="test_edp",
+        components=["ch4-gt", "electricity-demand"],
+        busses=["ch4", "electricity"],
+        basepath=None,
+        datetimeindex=None,
+        regions=["A", "B"],
+        links=["A-B"],
+    )
+
+    base_data = dict(edp.data)
+
+    base_rel_paths = dict(edp.rel_paths)
+
+    base_capacity = edp.data["ch4-gt"]["capacity"].copy()
+
+    changes = pd.Series({("ch4-gt", "capacity"): 10})
+
+    var = VariationGenerator(edp).create_var(
+        edp, changes, share_unchanged=share_unchanged
+    )
+
+    assert (var.data["ch4-gt"]["capacity"] == 10).all()
+
+    var.stack_components()
+
+    # the base datapackage keeps its frames, paths and values
+    assert edp.data.keys() == base_data.keys()
+
+    assert edp.rel_paths == base_rel_paths
+
+    pd.testing.assert_series_equal(edp.data["ch4-gt"]["capacity"], base_capacity)
+
+
+def test_create_var_does_not_share_frames():
+    edp = EnergyDataPackage.setup_default(
+        name="test_edp",
+        components=["ch4-gt", "electricity-demand"],
+        busses=["ch4", "electricity"],
+        basepath=None,
+        datetimeindex=None,
+        regions=["A", "B"],
+        links=["A-B"],
+    )
+
+    base_demand = edp.data["electricity-demand"].copy()
+
+    changes = pd.Series({("ch4-gt", "capacity"): 10})
+
+    var = VariationGenerator(edp).create_var(edp, changes)
+
+    # editing an unchanged resource of the variation leaves the base untouched
+    var.parametrize("electricity-demand", "amount", [1, 2])
+
+    pd.testing.assert_frame_equal(edp.data["electricity-demand"], base_demand)